@@ -1,6 +1,7 @@
 """Configuration for TLDRBot."""
 import os
 import json
+import re
 
 BOT_TOKEN = os.environ.get("BOT_TOKEN")
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
@@ -8,6 +9,7 @@ AI_MODEL = os.environ.get("AI_MODEL", "gpt-4o-mini")
 DATABASE_URL = os.environ.get("DATABASE_URL")
 MAX_MESSAGES = int(os.environ.get("MAX_MESSAGES", "400"))
 DAILY_LIMIT = int(os.environ.get("DAILY_LIMIT", "10"))
+DOWNLOAD_CONCURRENCY = int(os.environ.get("DOWNLOAD_CONCURRENCY", "3"))
 PORT = int(os.environ.get("PORT", "5000"))
 WEBHOOK_URL = os.environ.get("WEBHOOK_URL")
 
@@ -15,13 +17,15 @@ def validate_config():
     missing = [k for k in ["BOT_TOKEN", "OPENAI_API_KEY"] if not os.environ.get(k)]
     if missing:
         raise ValueError(f"Missing: {', '.join(missing)}")
+    if DOWNLOAD_CONCURRENCY < 1:
+        raise ValueError(f"DOWNLOAD_CONCURRENCY must be at least 1, got {DOWNLOAD_CONCURRENCY}")
 
 _DEFAULT_VIDEO_URL_PATTERNS = [
-    r'https?://(www\.)?tiktok\.com/',
-    r'https?://(www\.)?vt.tiktok\.com/', 
+    r'https?://(?:www\.)?tiktok\.com/',
+    r'https?://(?:www\.)?vt.tiktok\.com/', 
     r'https?://vm\.tiktok\.com/',
-    r'https?://(www\.)?instagram\.com/reel/',
-    r'https?://(www\.)?youtube\.com/shorts/',
+    r'https?://(?:www\.)?instagram\.com/reel/',
+    r'https?://(?:www\.)?youtube\.com/shorts/',
     r'https?://youtu\.be/',
 ]
 
@@ -36,3 +40,8 @@ if _video_patterns_env:
 else:
     VIDEO_URL_PATTERNS = _DEFAULT_VIDEO_URL_PATTERNS
 
+for _pattern in VIDEO_URL_PATTERNS:
+    try:
+        re.compile(_pattern)
+    except (re.error, TypeError) as e:
+        raise ValueError(f"Invalid regex {_pattern!r} in VIDEO_URL_PATTERNS: {e}")
@@ -1,11 +1,17 @@
 """AI service with snarky personality."""
-from openai import OpenAI
+from openai import AsyncOpenAI
+from cachetools import TTLCache
 from typing import Optional
+import hashlib
 import logging
 import random
 
 logger = logging.getLogger(__name__)
 
+# Completions for identical prompts are reused instead of calling the API again
+COMPLETION_CACHE_SIZE = 1024
+COMPLETION_CACHE_TTL = 7 * 24 * 60 * 60
+
 # Snarky remarks to append to summaries
 SNARKY_SUMMARY_REMARKS = [
     "There's your summary. You're welcome for doing the reading you couldn't be bothered to do.",
@@ -51,51 +57,66 @@ Format your response as:
 class AIService:
     def __init__(self, api_key: str | None, model: str = "gpt-4o-mini"):
         self.model = model
-        self.client = OpenAI(api_key=api_key)
+        self.client = AsyncOpenAI(api_key=api_key)
+        # {sha256(model + kind + prompt parts): completion text}, shared across chats
+        self._completion_cache = TTLCache(maxsize=COMPLETION_CACHE_SIZE, ttl=COMPLETION_CACHE_TTL)
+    
+    def _cache_key(self, *parts: str) -> str:
+        return hashlib.sha256("\x00".join((self.model, *parts)).encode()).hexdigest()
     
-    def get_summary(self, messages_text: str, num_messages: int) -> str:
+    async def get_summary(self, messages_text: str, num_messages: int) -> str:
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
-                    {"role": "user", "content": f"Summarize this conversation ({num_messages} messages):\n\n{messages_text}"}
-                ],
-                max_tokens=500
-            )
-            summary = response.choices[0].message.content or "I got nothing. Your chat broke me."
+            prompt = f"Summarize this conversation ({num_messages} messages):\n\n{messages_text}"
+            key = self._cache_key("summary", prompt)
+            summary = self._completion_cache.get(key)
+            if summary is None:
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_tokens=500
+                )
+                summary = response.choices[0].message.content or "I got nothing. Your chat broke me."
+                self._completion_cache[key] = summary
             remark = random.choice(SNARKY_SUMMARY_REMARKS)
             return f"{summary}\n\n---\n_\"{remark}\"_"
             
         except Exception as e:
-            logger.error(f"AI summary error: {e}")
+            logger.error("AI summary error: %s", e)
             return f"My brain broke trying to read your chat. Error: {str(e)}"
     
-    def get_mention_response(self, user_message: str, context: Optional[str] = None) -> str:
+    async def get_mention_response(self, user_message: str, context: Optional[str] = None) -> str:
         try:
             intro = random.choice(SNARKY_MENTION_INTROS)
             
-            messages = [{"role": "system", "content": SYSTEM_PROMPT}]
-            
-            if context:
-                messages.append({
-                    "role": "system", 
-                    "content": f"Recent chat context for reference:\n{context}"
-                })
-            
-            messages.append({"role": "user", "content": user_message})
-            
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,  # type: ignore
-                max_tokens=300
-            )
-            
-            reply = response.choices[0].message.content or "I have no words. And that's saying something."
+            # Context is part of the key, so the same question in a different chat state misses
+            key = self._cache_key("mention", context or "", user_message)
+            reply = self._completion_cache.get(key)
+            if reply is None:
+                messages = [{"role": "system", "content": SYSTEM_PROMPT}]
+                
+                if context:
+                    messages.append({
+                        "role": "system", 
+                        "content": f"Recent chat context for reference:\n{context}"
+                    })
+                
+                messages.append({"role": "user", "content": user_message})
+                
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,  # type: ignore
+                    max_tokens=300
+                )
+                
+                reply = response.choices[0].message.content or "I have no words. And that's saying something."
+                self._completion_cache[key] = reply
             return f"{intro}\n\n{reply}"
             
         except Exception as e:
-            logger.error(f"AI mention response error: {e}")
+            logger.error("AI mention response error: %s", e)
             return "My circuits are fried. Try again when I've recovered from your question."
     
     def get_current_model(self) -> str:
@@ -0,0 +1,14 @@
+"""Command argument parsing shared by handlers and plugins."""
+from typing import Optional, Sequence
+
+
+def parse_message_count(args: Optional[Sequence[str]], default: int, max_limit: int) -> int:
+    """Parse a /tldr-style message count, clamped to [1, max_limit]."""
+    if not args:
+        return default
+    arg = args[0]
+    # Allow one leading sign like int() does; anything else non-decimal falls back to the default
+    digits = arg[1:] if arg[:1] in ("+", "-") else arg
+    if not digits.isdecimal():
+        return default
+    return min(max(int(arg), 1), max_limit)
@@ -1,46 +1,68 @@
 """Bot orchestration."""
 import logging
 from telegram import BotCommand
-from telegram.ext import Application, ApplicationBuilder
-from typing import List, Callable, Awaitable, TYPE_CHECKING
+from telegram.ext import AIORateLimiter, Application, ApplicationBuilder
+from typing import List, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from plugins import Plugin
 
 logger = logging.getLogger(__name__)
 
+CONNECTION_POOL_SIZE = 256
+REQUEST_TIMEOUT = 30  # seconds
+# Stay under Telegram's flood limits instead of tripping RetryAfter back-offs
+OVERALL_MAX_RATE = 30  # messages per second, bot-wide
+GROUP_MAX_RATE = 20  # messages per minute, per group
+MAX_RETRIES = 3
+
 
 class TLDRBot:
+    __slots__ = ("token", "application", "_plugins")
+    
     def __init__(self, token: str):
         self.token = token
         self.application: Application | None = None
         self._plugins: List['Plugin'] = []
-        self._post_init_callbacks: List[Callable[[Application], Awaitable[None]]] = []
     
     def register_plugin(self, plugin: 'Plugin') -> None:
         self._plugins.append(plugin)
-        logger.info(f"Registered plugin: {plugin.name}")
+        logger.info("Registered plugin: %s", plugin.name)
     
     def setup(self) -> Application:
-        self.application = ApplicationBuilder().token(self.token).build()
-        original_post_init = None
+        self.application = (
+            ApplicationBuilder()
+            .token(self.token)
+            .concurrent_updates(True)
+            .connection_pool_size(CONNECTION_POOL_SIZE)
+            .pool_timeout(REQUEST_TIMEOUT)
+            .read_timeout(REQUEST_TIMEOUT)
+            .write_timeout(REQUEST_TIMEOUT)
+            .rate_limiter(AIORateLimiter(
+                overall_max_rate=OVERALL_MAX_RATE,
+                group_max_rate=GROUP_MAX_RATE,
+                max_retries=MAX_RETRIES,
+            ))
+            .build()
+        )
         
         for plugin in self._plugins:
             plugin.register(self.application)
-            
-            if self.application.post_init and self.application.post_init != original_post_init:
-                self._post_init_callbacks.append(self.application.post_init)
-                original_post_init = self.application.post_init
-            logger.info(f"Plugin '{plugin.name}' handlers registered")
+            logger.info("Plugin '%s' handlers registered", plugin.name)
         
-        self._post_init_callbacks.append(self._setup_commands)
         self.application.post_init = self._run_all_post_init
+        self.application.post_shutdown = self._run_all_post_shutdown
         
         return self.application
     
     async def _run_all_post_init(self, application: Application) -> None:
-        for callback in self._post_init_callbacks:
-            await callback(application)
+        for plugin in self._plugins:
+            await plugin.post_init(application)
+        await self._setup_commands(application)
+    
+    async def _run_all_post_shutdown(self, application: Application) -> None:
+        for plugin in self._plugins:
+            await plugin.post_shutdown(application)
     
     async def _setup_commands(self, application: Application) -> None:
         commands = []
@@ -50,7 +72,7 @@ class TLDRBot:
         
         if commands:
             await application.bot.set_my_commands(commands)
-            logger.info(f"Registered {len(commands)} bot commands")
+            logger.info("Registered %s bot commands", len(commands))
     
     def run_polling(self) -> None:
         if not self.application:
@@ -61,5 +83,5 @@ class TLDRBot:
     def run_webhook(self, listen: str, port: int, url_path: str, webhook_url: str) -> None:
         if not self.application:
             self.setup()
-        logger.info(f"Starting bot in webhook mode on port {port}...")
+        logger.info("Starting bot in webhook mode on port %s...", port)
         self.application.run_webhook(listen=listen, port=port, url_path=url_path, webhook_url=webhook_url)  # type: ignore[union-attr]
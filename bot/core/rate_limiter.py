@@ -10,6 +10,10 @@ class RateLimiter:
     def __init__(self, max_uses_per_day: int = 10):
         self.max_uses_per_day = max_uses_per_day
         self._usage: Dict[int, Dict] = {}
+        self._limit_message = (
+            f"🛑 Whoa there, chatty! You've used me {max_uses_per_day} times today. "
+            "I need a break from your neediness. Try again tomorrow."
+        )
     
     def _get_today(self) -> str:
         return datetime.now(timezone.utc).strftime("%Y-%m-%d")
@@ -19,21 +23,19 @@ class RateLimiter:
         if user_id not in self._usage or self._usage[user_id].get("date") != today:
             self._usage[user_id] = {"count": 0, "date": today}
     
-    def can_use(self, user_id: int) -> bool:
-        self._reset_if_new_day(user_id)
-        return self._usage[user_id]["count"] < self.max_uses_per_day
-    
-    def record_use(self, user_id: int) -> None:
+    def try_acquire(self, user_id: int) -> bool:
+        """Check the limit and record a use in one step, so concurrent requests can't overshoot it."""
         self._reset_if_new_day(user_id)
-        self._usage[user_id]["count"] += 1
+        usage = self._usage[user_id]
+        if usage["count"] >= self.max_uses_per_day:
+            return False
+        usage["count"] += 1
+        return True
     
     def remaining(self, user_id: int) -> int:
         self._reset_if_new_day(user_id)
         return self.max_uses_per_day - self._usage[user_id]["count"]
     
     def get_limit_message(self) -> str:
-        return (
-            f"🛑 Whoa there, chatty! You've used me {self.max_uses_per_day} times today. "
-            "I need a break from your neediness. Try again tomorrow."
-        )
+        return self._limit_message
 
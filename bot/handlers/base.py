@@ -4,6 +4,8 @@ Base handler class with shared utilities for all command handlers.
 from telegram import Update
 from telegram.ext import ContextTypes
 from typing import Optional
+from functools import partial
+import asyncio
 import logging
 from utils.analytics_storage import log_user_event
 
@@ -13,9 +15,16 @@ logger = logging.getLogger(__name__)
 RECEIPT_IMAGE, CONFIRMATION = range(2)
 
 
+def _log_analytics_failure(future: asyncio.Future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Failed to log analytics event: %s", future.exception())
+
+
 class BaseHandler:
     """Base class for all command handlers with shared utilities."""
     
+    __slots__ = ("ai_service",)
+    
     def __init__(self, ai_service=None):
         self.ai_service = ai_service
     
@@ -33,28 +42,23 @@ class BaseHandler:
             The sent message or None if unable to send
         """
         if update.message:
-            if parse_mode:
-                return await update.message.reply_text(text, parse_mode=parse_mode)
-            return await update.message.reply_text(text)
-        elif update.effective_chat:
-            if parse_mode:
-                return await context.bot.send_message(
-                    chat_id=update.effective_chat.id,
-                    text=text,
-                    parse_mode=parse_mode
-                )
+            return await update.message.reply_text(text, parse_mode=parse_mode)
+        if update.effective_chat:
             return await context.bot.send_message(
                 chat_id=update.effective_chat.id,
-                text=text
+                text=text,
+                parse_mode=parse_mode
             )
-        else:
-            logger.warning(f"No message or chat found in update for handler.")
-            return None
+        logger.warning("No message or chat found in update for handler.")
+        return None
     
     def log_analytics(self, update: Update, event_type: str, llm_name: Optional[str] = None):
         """
         Log a user event to analytics storage.
         
+        The write runs in the default executor so handlers can reply without
+        waiting on the database.
+        
         Args:
             update: Telegram update object
             event_type: Type of event (e.g., "help_command", "summarize_command")
@@ -67,7 +71,8 @@ class BaseHandler:
             if llm_name is None and self.ai_service:
                 llm_name = self.ai_service.get_current_model()
             
-            log_user_event(
+            write = partial(
+                log_user_event,
                 user_id=user.id,
                 chat_id=chat.id,
                 event_type=event_type,
@@ -76,4 +81,6 @@ class BaseHandler:
                 last_name=getattr(user, "last_name", None),
                 llm_name=llm_name,
             )
+            future = asyncio.get_running_loop().run_in_executor(None, write)
+            future.add_done_callback(_log_analytics_failure)
 
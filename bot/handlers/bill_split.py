@@ -3,9 +3,11 @@ Bill splitting conversation handlers for /splitbill command.
 """
 from telegram import Update
 from telegram.ext import ContextTypes, ConversationHandler
+import asyncio
+import hashlib
 import logging
 import os
-from io import BytesIO
+from cachetools import LRUCache, TTLCache
 from config.settings import OpenAIConfig
 from services.bill_splitter import (
     extract_receipt_data_from_image,
@@ -17,13 +19,66 @@ from handlers.base import BaseHandler, RECEIPT_IMAGE, CONFIRMATION
 
 logger = logging.getLogger(__name__)
 
+RECEIPT_CACHE_SIZE = 500
+PARSE_CACHE_SIZE = 1000
+PARSE_CACHE_TTL = 3600  # seconds
+
+SPLIT_BILL_INSTRUCTIONS = (
+    "To split a bill, send a photo of the receipt *with a caption* describing who paid for what.\n\n"
+    "Example caption:\n"
+    "Alice: Burger, Fries\n"
+    "Bob: Salad\n"
+    "Shared: Drinks\n\n"
+    "(Make sure item names in your caption roughly match the receipt.)"
+)
+
+CONFIRMATION_PROMPT = (
+    "\nPlease reply with 'confirm' to finalize the split, "
+    "send a new photo with caption to retry, or /cancel to abort."
+)
+
 
 class BillSplitHandler(BaseHandler):
     """Handler for bill splitting conversation flow."""
     
+    __slots__ = ("model_handler", "_receipt_cache", "_parse_cache")
+    
     def __init__(self, ai_service=None, model_handler=None):
         super().__init__(ai_service)
         self.model_handler = model_handler  # Reference to ModelHandler for receipt model
+        # {(image_digest, model): receipt_data}, so re-sent receipts skip the vision call
+        self._receipt_cache = LRUCache(maxsize=RECEIPT_CACHE_SIZE)
+        # {(caption, items, model): parsing_result} for confirm/retry cycles
+        self._parse_cache = TTLCache(maxsize=PARSE_CACHE_SIZE, ttl=PARSE_CACHE_TTL)
+    
+    async def _extract_receipt(self, image_bytes, receipt_model: str):
+        """Extract receipt data, reusing the result for an identical image and model."""
+        key = (hashlib.blake2b(image_bytes, digest_size=16).digest(), receipt_model)
+        receipt_data = self._receipt_cache.get(key)
+        if receipt_data is None:
+            receipt_data = await extract_receipt_data_from_image(image_bytes, receipt_model)
+            if receipt_data:
+                self._receipt_cache[key] = receipt_data
+        return receipt_data
+    
+    async def _parse_payment_context(self, caption: str, items):
+        """Parse the caption against the receipt items, reusing recent identical parses."""
+        model = self.ai_service.get_current_model() if self.ai_service else None
+        # The result holds these Item objects, so key on price and quantity too: a different
+        # receipt with the same item names must not reuse another receipt's prices
+        key = (caption, tuple((item.name, item.price, item.quantity) for item in items), model)
+        parsing_result = self._parse_cache.get(key)
+        if parsing_result is None:
+            parsing_result = await asyncio.to_thread(
+                parse_payment_context_with_llm,
+                caption,
+                items,
+                self.ai_service
+            )
+            # Error strings are not cached so a retry can succeed
+            if not isinstance(parsing_result, str):
+                self._parse_cache[key] = parsing_result
+        return parsing_result
     
     async def split_bill_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Entry point for bill splitting: ask user to send receipt photo with caption."""
@@ -32,17 +87,7 @@ class BillSplitHandler(BaseHandler):
         user = update.effective_user
         receipt_model = self.model_handler.get_receipt_model(user.id if user is not None else 0) if self.model_handler else os.getenv('OPENAI_MODEL', OpenAIConfig.MINI_MODEL)
         
-        await self.safe_reply(
-            update,
-            context,
-            "To split a bill, send a photo of the receipt *with a caption* describing who paid for what.\n\n"
-            "Example caption:\n"
-            "Alice: Burger, Fries\n"
-            "Bob: Salad\n"
-            "Shared: Drinks\n\n"
-            "(Make sure item names in your caption roughly match the receipt.)",
-            parse_mode="Markdown"
-        )
+        await self.safe_reply(update, context, SPLIT_BILL_INSTRUCTIONS, parse_mode="Markdown")
         await self.safe_reply(
             update,
             context,
@@ -52,8 +97,8 @@ class BillSplitHandler(BaseHandler):
 
     async def split_bill_photo_with_context(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle receipt photo with context caption."""
-        message = getattr(update, "message", None)
-        if not message or not getattr(message, "photo", None) or not getattr(message, "caption", None):
+        message = update.message
+        if not message or not message.photo or not message.caption:
             await self.safe_reply(
                 update,
                 context,
@@ -63,10 +108,7 @@ class BillSplitHandler(BaseHandler):
             return RECEIPT_IMAGE
 
         photo_file = await message.photo[-1].get_file()
-        image_stream = BytesIO()
-        await photo_file.download_to_memory(image_stream)
-        image_stream.seek(0)
-        image_bytes = image_stream.read()
+        image_bytes = await photo_file.download_as_bytearray()
         user_context_text = message.caption
 
         user = update.effective_user
@@ -75,7 +117,7 @@ class BillSplitHandler(BaseHandler):
         await self.safe_reply(update, context, f"Processing receipt and context using {receipt_model}...")
 
         # Extract receipt data
-        receipt_data = await extract_receipt_data_from_image(image_bytes, receipt_model)
+        receipt_data = await self._extract_receipt(image_bytes, receipt_model)
         if not receipt_data:
             await self.safe_reply(
                 update,
@@ -85,11 +127,7 @@ class BillSplitHandler(BaseHandler):
             return RECEIPT_IMAGE
 
         # Parse context and prepare confirmation
-        parsing_result = parse_payment_context_with_llm(
-            user_context_text,
-            receipt_data.items,
-            self.ai_service
-        )
+        parsing_result = await self._parse_payment_context(user_context_text, receipt_data.items)
 
         # Handle parsing errors (returns error message string)
         if isinstance(parsing_result, str):
@@ -103,10 +141,6 @@ class BillSplitHandler(BaseHandler):
         # Unpack parsing results
         assignments, shared_items, participants = parsing_result
 
-        # Defensive: ensure context.user_data is a dict
-        if not hasattr(context, "user_data") or context.user_data is None:
-            context.user_data = {}
-
         # Store intermediate data for confirmation
         context.user_data['bill_split'] = {
             'receipt_data': receipt_data,
@@ -115,32 +149,24 @@ class BillSplitHandler(BaseHandler):
             'participants': participants,
         }
 
-        # Build confirmation summary
+        # Build confirmation summary: assigned items per person, shared items, participants
         lines = ["I've parsed your receipt as follows:"]
-        # Assigned items per person
-        for person, items in assignments.items():
-            item_names = ", ".join(item.name for item in items)
-            lines.append(f"- {person}: {item_names}")
-        # Shared items
+        lines.extend(
+            f"- {person}: {', '.join(item.name for item in items)}"
+            for person, items in assignments.items()
+        )
         if shared_items:
-            shared_names = ", ".join(item.name for item in shared_items)
-            lines.append(f"- Shared: {shared_names}")
-        # Participants
+            lines.append(f"- Shared: {', '.join(item.name for item in shared_items)}")
         if participants:
-            parts = ", ".join(participants)
-            lines.append(f"Participants: {parts}")
-        lines.append("\nPlease reply with 'confirm' to finalize the split, send a new photo with caption to retry, or /cancel to abort.")
+            lines.append(f"Participants: {', '.join(participants)}")
+        lines.append(CONFIRMATION_PROMPT)
 
         await self.safe_reply(update, context, "\n".join(lines))
         return CONFIRMATION
 
     async def split_bill_confirm(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Finalize bill split after user confirmation."""
-        # Defensive: ensure context.user_data is a dict
-        if not hasattr(context, "user_data") or context.user_data is None:
-            context.user_data = {}
-
-        data = context.user_data.get('bill_split') if isinstance(context.user_data, dict) else None
+        data = context.user_data.get('bill_split')
 
         if not data:
             await self.safe_reply(
@@ -167,8 +193,7 @@ class BillSplitHandler(BaseHandler):
         
         if isinstance(split_result, str):
             await self.safe_reply(update, context, f"Calculation error: {split_result}")
-            if isinstance(context.user_data, dict):
-                context.user_data.pop('bill_split', None)
+            context.user_data.pop('bill_split', None)
             return ConversationHandler.END
 
         # Format and send final results
@@ -181,15 +206,13 @@ class BillSplitHandler(BaseHandler):
         await self.safe_reply(update, context, final_message, parse_mode="Markdown")
         
         # Clean up
-        if isinstance(context.user_data, dict):
-            context.user_data.pop('bill_split', None)
+        context.user_data.pop('bill_split', None)
         return ConversationHandler.END
 
     async def split_bill_cancel(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Cancel the bill-splitting flow."""
-        # Optionally clean up any stored data
-        if hasattr(context, "user_data") and isinstance(context.user_data, dict):
-            context.user_data.pop('bill_split', None)
+        # Clean up any stored data
+        context.user_data.pop('bill_split', None)
         await self.safe_reply(update, context, "Bill splitting cancelled.")
         return ConversationHandler.END
 
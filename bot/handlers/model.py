@@ -5,6 +5,7 @@ from telegram import Update
 from telegram.ext import ContextTypes
 import logging
 import os
+from cachetools import LRUCache
 from services.ai import StrategyRegistry
 from services.ai.openai_strategy import OpenAIStrategy
 from services.ai.groq_strategy import GroqAIStrategy
@@ -22,48 +23,84 @@ ALLOWED_RECEIPT_MODELS = [
     OpenAIConfig.FOUR_ONE_MODEL,
 ]
 
+# {provider: (config_class, strategy_class, model)}
+_PROVIDER_MAP = {
+    "openai-mini": (OpenAIConfig, OpenAIStrategy, OpenAIConfig.MINI_MODEL),
+    "openai-4o": (OpenAIConfig, OpenAIStrategy, OpenAIConfig.O4_MODEL),
+    "openai-4.1": (OpenAIConfig, OpenAIStrategy, OpenAIConfig.FOUR_ONE_MODEL),
+    "groq": (GroqAIConfig, GroqAIStrategy, getattr(GroqAIConfig, 'MODEL', '')),
+    "deepseek": (DeepSeekAIConfig, DeepSeekStrategy, getattr(DeepSeekAIConfig, 'MODEL', '')),
+}
+STRATEGY_CACHE_SIZE = 1024
+
+# {(provider, api_key): strategy}; entries for a user's key are evicted when it is cleared or replaced
+_strategy_cache = LRUCache(maxsize=STRATEGY_CACHE_SIZE)
+
+
+def _key_provider(provider: str) -> str:
+    # Use a shared key for all OpenAI models
+    return 'openai' if provider.startswith('openai') else provider
+
+
+def _build_strategy(provider: str, key: str):
+    """Reuse one strategy per (provider, key) instead of constructing a client per request."""
+    strategy = _strategy_cache.get((provider, key))
+    if strategy is None:
+        _, strategy_class, model = _PROVIDER_MAP[provider]
+        strategy = _strategy_cache[(provider, key)] = strategy_class(key, model)
+    return strategy
+
+
+def _evict_strategies(key: str) -> None:
+    """Drop every cached strategy built from this API key."""
+    for cache_key in [cache_key for cache_key in _strategy_cache if cache_key[1] == key]:
+        _strategy_cache.pop(cache_key, None)
+
+
+def resolve_user_strategy(user_id: int, provider: str):
+    """Return a strategy for the provider, using the user's API key if they set one."""
+    provider = provider.lower()
+    if provider not in _PROVIDER_MAP:
+        raise ValueError(f"Unknown provider: {provider}")
+
+    config_class = _PROVIDER_MAP[provider][0]
+
+    user_key = get_user_api_key(user_id, _key_provider(provider))
+    key = user_key if user_key is not None else (config_class.API_KEY if getattr(config_class, 'API_KEY', None) is not None else "")
+
+    return _build_strategy(provider, key)
+
 
 class ModelHandler(BaseHandler):
     """Handler for model switching and API key management."""
     
+    __slots__ = (
+        "user_selected_model",
+        "user_receipt_model",
+        "_available_models",
+        "_available_model_set",
+        "_invalid_model_message",
+    )
+    
     def __init__(self, ai_service=None):
         super().__init__(ai_service)
         self.user_selected_model = {}  # {user_id: provider_name}
         self.user_receipt_model = {}  # {user_id: openai_model_name}
+        # Strategies are registered at import time, so the provider list is fixed
+        self._available_models = tuple(StrategyRegistry.available_strategies())
+        self._available_model_set = frozenset(self._available_models)
+        self._invalid_model_message = f"Invalid model name. Available models: {', '.join(self._available_models)}"
     
-    def _get_user_strategy(self, user_id: int, provider: str):
+    def get_user_strategy(self, user_id: int, provider: str):
         """Return a strategy for the provider, using user key if available."""
-        provider = provider.lower()
-        return self._resolve_strategy(
-            user_id,
-            provider,
-            {
-                "openai-mini": (OpenAIConfig, OpenAIStrategy, OpenAIConfig.MINI_MODEL),
-                "openai-4o": (OpenAIConfig, OpenAIStrategy, OpenAIConfig.O4_MODEL),
-                "openai-4.1": (OpenAIConfig, OpenAIStrategy, OpenAIConfig.FOUR_ONE_MODEL),
-                "groq": (GroqAIConfig, GroqAIStrategy),
-                "deepseek": (DeepSeekAIConfig, DeepSeekStrategy),
-            },
-        )
-
-    def _resolve_strategy(self, user_id: int, provider: str, config_map: dict):
-        """Helper function to resolve API key and model for a given provider."""
-        if provider not in config_map:
-            raise ValueError(f"Unknown provider: {provider}")
-
-        mapping = config_map[provider]
-        if len(mapping) == 3:
-            config_class, strategy_class, model = mapping
-        else:
-            config_class, strategy_class = mapping
-            model = getattr(config_class, 'MODEL', '')
-
-        # Use a shared key for all OpenAI models
-        key_provider = 'openai' if provider.startswith('openai') else provider
-        user_key = get_user_api_key(user_id, key_provider)
-        key = user_key if user_key is not None else (config_class.API_KEY if getattr(config_class, 'API_KEY', None) is not None else "")
-
-        return strategy_class(key, model)
+        return resolve_user_strategy(user_id, provider)
+    
+    def _evict_user_strategies(self, user_id: int, provider: str) -> None:
+        """Forget strategies built from the user's current key before it is replaced or cleared."""
+        for name in {provider, _key_provider(provider)}:
+            old_key = get_user_api_key(user_id, name)
+            if old_key is not None:
+                _evict_strategies(old_key)
     
     async def switch_model(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /switch_model command."""
@@ -74,10 +111,9 @@ class ModelHandler(BaseHandler):
             return
 
         new_model = context.args[0].lower()
-        available_models = StrategyRegistry.available_strategies()
         
-        if new_model not in available_models:
-            await self.safe_reply(update, context, f"Invalid model name. Available models: {', '.join(available_models)}")
+        if new_model not in self._available_model_set:
+            await self.safe_reply(update, context, self._invalid_model_message)
             return
 
         user = update.effective_user
@@ -87,71 +123,74 @@ class ModelHandler(BaseHandler):
 
         try:
             # Use user's key if available
-            strategy = self._get_user_strategy(user.id if user is not None else 0, new_model)
+            strategy = self.get_user_strategy(user.id if user is not None else 0, new_model)
             self.ai_service.set_strategy(strategy)
             await self.safe_reply(update, context, f"Model switched to {new_model}")
 
         except Exception as e:
-            logger.error(f"Error switching model: {str(e)}")
+            logger.error("Error switching model: %s", e)
             await self.safe_reply(update, context, f"Failed to switch model: {str(e)}")
 
     async def set_api_key(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /set_api_key command."""
         user = update.effective_user
-        if user is None or update.message is None:
+        if user is None:
             return
         
         args = context.args
         if not args or len(args) != 2:
-            await update.message.reply_text("Usage: /set_api_key <provider> <key>")
+            await self.safe_reply(update, context, "Usage: /set_api_key <provider> <key>")
             return
         
         provider, key = args
         provider = provider.lower()
-        available_models = StrategyRegistry.available_strategies()
         
-        if provider not in available_models:
-            await update.message.reply_text(
+        if provider not in self._available_model_set:
+            await self.safe_reply(
+                update,
+                context,
                 f"❗ Invalid provider '{provider}'.\n"
-                f"Please use one of: {', '.join(f'`{m}`' for m in available_models)}\n"
+                f"Please use one of: {', '.join(f'`{m}`' for m in self._available_models)}\n"
                 "You can also use /list_providers to see all valid options."
             )
             return
         
+        self._evict_user_strategies(user.id, provider)
         set_user_api_key(user.id, provider, key)
-        await update.message.reply_text(f"API key for {provider} set successfully! Future requests will use your key.")
+        await self.safe_reply(update, context, f"API key for {provider} set successfully! Future requests will use your key.")
 
     async def clear_api_key(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /clear_api_key command."""
         user = update.effective_user
-        if user is None or update.message is None:
+        if user is None:
             return
         
         args = context.args
         if not args or len(args) != 1:
-            await update.message.reply_text("Usage: /clear_api_key <provider>")
+            await self.safe_reply(update, context, "Usage: /clear_api_key <provider>")
             return
         
         provider = args[0].lower()
-        available_models = StrategyRegistry.available_strategies()
         
-        if provider not in available_models:
-            await update.message.reply_text(
+        if provider not in self._available_model_set:
+            await self.safe_reply(
+                update,
+                context,
                 f"❗ Invalid provider '{provider}'.\n"
-                f"Please use one of: {', '.join(f'`{m}`' for m in available_models)}\n"
+                f"Please use one of: {', '.join(f'`{m}`' for m in self._available_models)}\n"
                 "You can also use /list_providers to see all valid options."
             )
             return
         
+        self._evict_user_strategies(user.id, provider)
         clear_user_api_key(user.id, provider)
-        await update.message.reply_text(f"API key for {provider} cleared. The bot will use the default key.")
+        await self.safe_reply(update, context, f"API key for {provider} cleared. The bot will use the default key.")
 
     async def list_providers(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /list_providers command."""
-        available_models = StrategyRegistry.available_strategies()
         msg = (
             "🗝️ *Valid Providers for BYOK and Model Switching:*\n\n"
-            + "\n".join(f"• `{m}`" for m in available_models)
+            + "\n".join(f"• `{m}`" for m in self._available_models)
             + "\n\nUse these names for `/set_api_key`, `/clear_api_key`, and `/switch_model`."
         )
         await self.safe_reply(update, context, msg, parse_mode="Markdown")
@@ -159,24 +198,28 @@ class ModelHandler(BaseHandler):
     async def set_receipt_model(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /set_receipt_model command."""
         user = update.effective_user
-        if user is None or update.message is None:
+        if user is None:
             return
 
         if not context.args or len(context.args) != 1:
-            await update.message.reply_text(
+            await self.safe_reply(
+                update,
+                context,
                 f"Usage: /set_receipt_model <model>\nAvailable: {', '.join(ALLOWED_RECEIPT_MODELS)}"
             )
             return
 
         model_name = context.args[0]
         if model_name not in ALLOWED_RECEIPT_MODELS:
-            await update.message.reply_text(
+            await self.safe_reply(
+                update,
+                context,
                 f"Invalid model name. Choose from: {', '.join(ALLOWED_RECEIPT_MODELS)}"
             )
             return
 
         self.user_receipt_model[user.id] = model_name
-        await update.message.reply_text(f"Receipt parsing model set to {model_name}.")
+        await self.safe_reply(update, context, f"Receipt parsing model set to {model_name}.")
     
     def get_receipt_model(self, user_id: int) -> str:
         """Get the receipt model for a user, or default."""
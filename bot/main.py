@@ -9,6 +9,7 @@ import config
 from core import TLDRBot, AIService, RateLimiter
 from plugins import HelpPlugin, SummarizePlugin, MentionReplyPlugin, AutoDownloadPlugin
 from storage import MemoryStorage
+from storage.analytics import init_database, create_tables
 
 # Configure logging
 logging.basicConfig(
@@ -17,12 +18,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Commands and anything else starting with "/" are dropped by PTB before store_message runs
+STORE_MESSAGE_FILTER = filters.TEXT & ~filters.COMMAND & ~filters.Regex(r"^/")
+
 
 def main():
     config.validate_config()
     
     if config.DATABASE_URL:
-        from storage.analytics import init_database, create_tables
         if init_database(config.DATABASE_URL):
             create_tables()
     
@@ -34,18 +37,18 @@ def main():
     bot.register_plugin(HelpPlugin())
     bot.register_plugin(SummarizePlugin(ai_service, rate_limiter, memory))
     bot.register_plugin(MentionReplyPlugin(ai_service, rate_limiter, memory))
-    bot.register_plugin(AutoDownloadPlugin())
+    bot.register_plugin(AutoDownloadPlugin(max_concurrent_downloads=config.DOWNLOAD_CONCURRENCY))
     
     app = bot.setup()
     
     async def store_message(update, context):
         if update.message and update.message.text and update.effective_chat and update.effective_user:
-            if update.message.text.startswith('/'):
-                return
             sender_name = update.effective_user.first_name or update.effective_user.username or "Someone"
             memory.store_message(update.effective_chat.id, sender_name, update.message.text)
     
-    app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, store_message), group=99)
+    # Store ahead of the plugin handlers: with concurrent updates a later group would only run
+    # after a mention's LLM call or a video reply, appending messages out of order
+    app.add_handler(MessageHandler(STORE_MESSAGE_FILTER, store_message), group=-1)
     
     logger.info("🤖 TLDRBot starting up...")
     
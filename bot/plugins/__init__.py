@@ -26,6 +26,16 @@ class Plugin(ABC):
     def register(self, app: Application) -> None:
         """Register handlers with the application."""
         pass
+    
+    async def post_init(self, app: Application) -> None:
+        """Called once the application is initialized and its loop is running.
+        Override this to start background work or fetch bot info."""
+        pass
+    
+    async def post_shutdown(self, app: Application) -> None:
+        """Called after the application has shut down.
+        Override this to stop anything started in post_init."""
+        pass
 
 
 # Import plugins for convenience
@@ -4,6 +4,9 @@ import os
 import logging
 import asyncio
 import random
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 import yt_dlp
 from telegram import Update, Message
 from telegram.ext import Application, MessageHandler, ContextTypes, filters
@@ -12,7 +15,34 @@ from config import VIDEO_URL_PATTERNS
 
 logger = logging.getLogger(__name__)
 
-URL_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in VIDEO_URL_PATTERNS]
+URL_RE = re.compile(r'https?://[^\s<>"{}|\\^`\[\]]+')
+_VIDEO_URL_REGEXES = tuple(re.compile(pattern, re.IGNORECASE) for pattern in VIDEO_URL_PATTERNS)
+# Combining renumbers groups, which would silently repoint backreferences like "(a)\1",
+# so only group-free patterns are joined; the rest are matched one by one
+if all(regex.groups == 0 for regex in _VIDEO_URL_REGEXES):
+    try:
+        # One alternation so each URL is matched in a single pass; "(?!)" keeps an empty list matching nothing
+        VIDEO_URL_MATCHERS = (re.compile(
+            "|".join(f"(?:{pattern})" for pattern in VIDEO_URL_PATTERNS) or "(?!)",
+            re.IGNORECASE,
+        ),)
+    except re.error:
+        # Inline flags like "(?i)" are only valid at the start of a pattern
+        VIDEO_URL_MATCHERS = _VIDEO_URL_REGEXES
+else:
+    VIDEO_URL_MATCHERS = _VIDEO_URL_REGEXES
+
+YDL_OPTS = {
+    'format': 'best[filesize<50M]/best',
+    'nocheckcertificate': True,
+    'quiet': True,
+    'no_warnings': True,
+    'extractor_args': {
+        'tiktok': {
+            'api_hostname': 'api22-normal-c-useast2a.tiktokv.com'
+        }
+    }
+}
 
 PROCESSING_MESSAGES = [
     "⏳ Spotted a video link! Fetching it for you...",
@@ -39,9 +69,14 @@ ERROR_MESSAGES = [
 
 
 class AutoDownloadPlugin(Plugin):
-    def __init__(self):
+    def __init__(self, max_concurrent_downloads: int = 3):
         self._download_queue: asyncio.Queue = asyncio.Queue()
+        # Bounds yt-dlp jobs in flight so one slow download doesn't hold up the rest
+        self._download_slots = asyncio.Semaphore(max_concurrent_downloads)
+        # yt-dlp gets its own threads so long downloads can't starve the default executor
+        self._ydl_pool = ThreadPoolExecutor(max_workers=max_concurrent_downloads, thread_name_prefix="yt-dlp")
         self._worker_task: asyncio.Task | None = None
+        self._background_tasks: set[asyncio.Task] = set()
     
     @property
     def name(self) -> str:
@@ -52,14 +87,12 @@ class AutoDownloadPlugin(Plugin):
             filters.TEXT & ~filters.COMMAND,
             self.check_for_urls
         ), group=2)
-        app.post_init = self._start_worker
-        app.post_shutdown = self._stop_worker
     
-    async def _start_worker(self, app: Application) -> None:
+    async def post_init(self, app: Application) -> None:
         self._worker_task = asyncio.create_task(self._download_worker(app))
         logger.info("Download worker started")
     
-    async def _stop_worker(self, app: Application) -> None:
+    async def post_shutdown(self, app: Application) -> None:
         if self._worker_task:
             self._worker_task.cancel()
             try:
@@ -67,15 +100,29 @@ class AutoDownloadPlugin(Plugin):
             except asyncio.CancelledError:
                 pass
             logger.info("Download worker stopped")
+        # Stop in-flight jobs and deletes before the pool goes away, so none hit a closed executor
+        tasks = list(self._background_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._ydl_pool.shutdown(wait=False, cancel_futures=True)
+    
+    def _delete_in_background(self, message: Message) -> None:
+        task = asyncio.create_task(self._safe_delete(message))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+    
+    @staticmethod
+    async def _safe_delete(message: Message) -> None:
+        try:
+            await message.delete()
+        except Exception:
+            pass
     
     def _extract_video_url(self, text: str) -> str | None:
-        url_pattern = r'https?://[^\s<>"{}|\\^`\[\]]+'
-        urls = re.findall(url_pattern, text)
-        
-        for url in urls:
-            for pattern in URL_PATTERNS:
-                if pattern.search(url):
-                    return url
+        for url in URL_RE.findall(text):
+            if any(matcher.search(url) for matcher in VIDEO_URL_MATCHERS):
+                return url
         return None
     
     async def check_for_urls(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -88,7 +135,7 @@ class AutoDownloadPlugin(Plugin):
         if not chat_id:
             return
         
-        logger.info(f"Video URL detected: {url}")
+        logger.info("Video URL detected: %s", url)
         status_msg = await update.message.reply_text(random.choice(PROCESSING_MESSAGES))
         
         job = {
@@ -99,86 +146,82 @@ class AutoDownloadPlugin(Plugin):
             "bot": context.bot,
         }
         await self._download_queue.put(job)
-        logger.info(f"Download job queued for {url}")
+        logger.info("Download job queued for %s", url)
     
     async def _download_worker(self, app: Application) -> None:
         while True:
             try:
                 job = await self._download_queue.get()
-                url = job["url"]
-                chat_id = job["chat_id"]
-                reply_to = job["reply_to_message_id"]
-                status_msg: Message = job["status_message"]
-                bot = job["bot"]
-                
-                logger.info(f"Processing download: {url}")
-                try:
-                    await status_msg.edit_text("⏳ Downloading... This might take a moment.")
-                except Exception:
-                    pass
-                
-                video_path = await self._download_video(url)
-                
-                if video_path and os.path.exists(video_path):
-                    try:
-                        await status_msg.delete()
-                    except Exception:
-                        pass
-                    
-                    try:
-                        with open(video_path, 'rb') as video_file:
-                            await bot.send_video(
-                                chat_id=chat_id, video=video_file,
-                                caption=random.choice(SUCCESS_MESSAGES),
-                                reply_to_message_id=reply_to
-                            )
-                        logger.info(f"Video sent for {url}")
-                    except Exception as e:
-                        logger.error(f"Failed to send video: {e}")
-                        await bot.send_message(
-                            chat_id=chat_id, reply_to_message_id=reply_to,
-                            text="😬 Downloaded but couldn't send. File might be too large."
-                        )
-                    
-                    try:
-                        os.remove(video_path)
-                    except Exception:
-                        pass
-                else:
-                    error_text = random.choice(ERROR_MESSAGES)
-                    try:
-                        await status_msg.edit_text(error_text)
-                    except Exception:
-                        await bot.send_message(chat_id=chat_id, text=error_text, reply_to_message_id=reply_to)
-                
-                self._download_queue.task_done()
+                # Take a slot before spawning so queued jobs wait here, not as idle tasks
+                await self._download_slots.acquire()
+                task = asyncio.create_task(self._run_job(job))
+                self._background_tasks.add(task)
+                task.add_done_callback(self._background_tasks.discard)
             except asyncio.CancelledError:
                 break
-            except Exception as e:
-                logger.error(f"Download worker error: {e}")
-                await asyncio.sleep(1)
     
-    async def _download_video(self, url: str) -> str | None:
-        ydl_opts = {
-            'format': 'best[filesize<50M]/best',
-            'outtmpl': '/tmp/%(id)s.%(ext)s',
-            'nocheckcertificate': True,
-            'quiet': True,
-            'no_warnings': True,
-            'extractor_args': {
-                'tiktok': {
-                    'api_hostname': 'api22-normal-c-useast2a.tiktokv.com'
-                }
-            }
-        }
+    async def _run_job(self, job: dict) -> None:
+        try:
+            await self._process_job(job)
+        except Exception as e:
+            logger.error("Download worker error: %s", e)
+        finally:
+            self._download_slots.release()
+            self._download_queue.task_done()
+    
+    async def _process_job(self, job: dict) -> None:
+        url = job["url"]
+        chat_id = job["chat_id"]
+        reply_to = job["reply_to_message_id"]
+        status_msg: Message = job["status_message"]
+        bot = job["bot"]
         
+        logger.info("Processing download: %s", url)
+        try:
+            await status_msg.edit_text("⏳ Downloading... This might take a moment.")
+        except Exception:
+            pass
+        
+        # Each job gets its own directory so concurrent downloads of one video can't share files
+        out_dir = tempfile.mkdtemp(prefix="tldrbot-dl-")
+        try:
+            video_path = await self._download_video(url, out_dir)
+            
+            if video_path and os.path.exists(video_path):
+                self._delete_in_background(status_msg)
+                
+                try:
+                    with open(video_path, 'rb') as video_file:
+                        await bot.send_video(
+                            chat_id=chat_id, video=video_file,
+                            caption=random.choice(SUCCESS_MESSAGES),
+                            reply_to_message_id=reply_to
+                        )
+                    logger.info("Video sent for %s", url)
+                except Exception as e:
+                    logger.error("Failed to send video: %s", e)
+                    await bot.send_message(
+                        chat_id=chat_id, reply_to_message_id=reply_to,
+                        text="😬 Downloaded but couldn't send. File might be too large."
+                    )
+            else:
+                error_text = random.choice(ERROR_MESSAGES)
+                try:
+                    await status_msg.edit_text(error_text)
+                except Exception:
+                    await bot.send_message(chat_id=chat_id, text=error_text, reply_to_message_id=reply_to)
+        finally:
+            shutil.rmtree(out_dir, ignore_errors=True)
+    
+    async def _download_video(self, url: str, out_dir: str) -> str | None:
+        ydl_opts = {**YDL_OPTS, 'outtmpl': os.path.join(out_dir, '%(id)s.%(ext)s')}
         try:
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             def download():
                 with yt_dlp.YoutubeDL(ydl_opts) as ydl:
                     info_dict = ydl.extract_info(url, download=True)
                     return ydl.prepare_filename(info_dict)
-            return await loop.run_in_executor(None, download)
+            return await loop.run_in_executor(self._ydl_pool, download)
         except Exception as e:
-            logger.error(f"yt-dlp error for {url}: {e}")
+            logger.error("yt-dlp error for %s: %s", url, e)
             return None
@@ -43,5 +43,5 @@ class HelpPlugin(Plugin):
             HELP_TEXT,
             parse_mode="Markdown"
         )
-        logger.info(f"Help shown to user {update.effective_user.id if update.effective_user else 'unknown'}")
+        logger.info("Help shown to user %s", update.effective_user.id if update.effective_user else 'unknown')
 
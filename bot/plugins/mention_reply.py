@@ -22,7 +22,6 @@ class MentionReplyPlugin(Plugin):
         return "mention_reply"
     
     def register(self, app: Application) -> None:
-        app.post_init = self._store_bot_username
         app.add_handler(MessageHandler(
             filters.TEXT & filters.Entity("mention"),
             self.handle_mention
@@ -32,10 +31,10 @@ class MentionReplyPlugin(Plugin):
             self.handle_reply
         ))
     
-    async def _store_bot_username(self, app: Application) -> None:
+    async def post_init(self, app: Application) -> None:
         bot_info = await app.bot.get_me()
         self.bot_username = f"@{bot_info.username}".lower()
-        logger.info(f"Bot username stored: {self.bot_username}")
+        logger.info("Bot username stored: %s", self.bot_username)
     
     async def handle_mention(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         if not update.message or not update.message.text or not update.effective_user:
@@ -64,7 +63,7 @@ class MentionReplyPlugin(Plugin):
         user_id = update.effective_user.id
         chat_id = update.effective_chat.id
         
-        if not self.rate_limiter.can_use(user_id):
+        if not self.rate_limiter.try_acquire(user_id):
             await update.message.reply_text(self.rate_limiter.get_limit_message())
             return
         
@@ -76,11 +75,10 @@ class MentionReplyPlugin(Plugin):
         if not user_message:
             user_message = "Hey"
         
-        recent_messages = self.memory.get_recent_messages(chat_id, 20)
-        context_text = "\n".join(recent_messages[-10:]) if recent_messages else None
+        recent_messages = self.memory.get_recent_messages(chat_id, 10)
+        context_text = "\n".join(recent_messages) if recent_messages else None
         
-        self.rate_limiter.record_use(user_id)
-        response = self.ai.get_mention_response(user_message, context_text)
+        response = await self.ai.get_mention_response(user_message, context_text)
         
         await update.message.reply_text(response)
         
@@ -91,5 +89,5 @@ class MentionReplyPlugin(Plugin):
                 parse_mode="Markdown"
             )
         
-        logger.info(f"Mention response sent to user {user_id}")
+        logger.info("Mention response sent to user %s", user_id)
 
@@ -1,20 +1,37 @@
 """Summarize plugin for /tldr command."""
-from telegram import Update
+from telegram import LinkPreviewOptions, Update
 from telegram.ext import Application, CommandHandler, ContextTypes
 from plugins import Plugin
 from core.ai import AIService
+from core.args import parse_message_count
 from core.rate_limiter import RateLimiter
 from storage.memory import MemoryStorage
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
+NO_MESSAGES_TEXT = (
+    "🤷 I don't have any messages to summarize. "
+    "Either you just added me or everyone's been unusually quiet. "
+    "Both are concerning."
+)
+
+PROGRESS_TEXT = "⏳ _Analyzing your chat... This better be worth my time._"
+
+# Shared by the edit and its reply fallback; summaries quoting links shouldn't unfurl previews
+SUMMARY_SEND_KWARGS = {
+    "parse_mode": "Markdown",
+    "link_preview_options": LinkPreviewOptions(is_disabled=True),
+}
 
 class SummarizePlugin(Plugin):
     def __init__(self, ai_service: AIService, rate_limiter: RateLimiter, memory: MemoryStorage):
         self.ai = ai_service
         self.rate_limiter = rate_limiter
         self.memory = memory
+        # {(chat_id, message_count, newest_message): summary task}, shared by concurrent /tldr calls
+        self._inflight: dict[tuple[int, int], asyncio.Task] = {}
     
     @property
     def name(self) -> str:
@@ -27,6 +44,17 @@ class SummarizePlugin(Plugin):
     def register(self, app: Application) -> None:
         app.add_handler(CommandHandler("tldr", self.summarize))
     
+    async def _get_summary(self, chat_id: int, messages: list[str]) -> str:
+        # The newest message pins the window, so a call over a newer window never gets an older summary
+        key = (chat_id, len(messages), messages[-1])
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self.ai.get_summary("\n".join(messages), len(messages)))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so one cancelled caller doesn't cancel the call for the others
+        return await asyncio.shield(task)
+    
     async def summarize(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         if not update.message or not update.effective_chat or not update.effective_user:
             return
@@ -34,51 +62,33 @@ class SummarizePlugin(Plugin):
         user_id = update.effective_user.id
         chat_id = update.effective_chat.id
         
-        if not self.rate_limiter.can_use(user_id):
-            await update.message.reply_text(self.rate_limiter.get_limit_message())
-            return
-        
-        num_messages = 50
-        if context.args:
-            try:
-                num_messages = min(max(int(context.args[0]), 1), 400)
-            except ValueError:
-                pass
+        num_messages = parse_message_count(context.args, default=50, max_limit=400)
         
         messages = self.memory.get_recent_messages(chat_id, num_messages)
         if not messages:
-            await update.message.reply_text(
-                "🤷 I don't have any messages to summarize. "
-                "Either you just added me or everyone's been unusually quiet. "
-                "Both are concerning."
-            )
+            await update.message.reply_text(NO_MESSAGES_TEXT)
             return
         
-        progress_msg = await update.message.reply_text(
-            "⏳ _Analyzing your chat... This better be worth my time._",
-            parse_mode="Markdown"
-        )
-        
-        self.rate_limiter.record_use(user_id)
+        if not self.rate_limiter.try_acquire(user_id):
+            await update.message.reply_text(self.rate_limiter.get_limit_message())
+            return
         remaining = self.rate_limiter.remaining(user_id)
         
-        combined_text = "\n".join(messages)
-        summary = self.ai.get_summary(combined_text, len(messages))
+        progress_msg = await update.message.reply_text(PROGRESS_TEXT, parse_mode="Markdown")
+        
+        summary = await self._get_summary(chat_id, messages)
         
         final_text = f"📝 *Summary* (last {len(messages)} messages)\n\n{summary}"
         if remaining <= 3:
             final_text += f"\n\n⚠️ _You have {remaining} uses left today. Pace yourself._"
         
         try:
-            await progress_msg.edit_text(
-                final_text,
-                parse_mode="Markdown"
-            )
+            await progress_msg.edit_text(final_text, **SUMMARY_SEND_KWARGS)
         except Exception as e:
-            logger.warning(f"Failed to edit message: {e}")
-            await update.message.reply_text(final_text, parse_mode="Markdown")
+            logger.warning("Failed to edit message: %s", e)
+            await update.message.reply_text(final_text, **SUMMARY_SEND_KWARGS)
         
         self.memory.set_summary_context(chat_id, progress_msg.message_id, messages)
         
-        logger.info(f"Summary generated for user {user_id} in chat {chat_id} ({len(messages)} messages)")
+        logger.info("Summary generated for user %s in chat %s (%s messages)", user_id, chat_id, len(messages))
 
@@ -1,5 +1,6 @@
 """In-memory message storage for chat history."""
 from collections import defaultdict, deque
+from itertools import islice
 from typing import List, Dict, Any
 
 
@@ -13,7 +14,11 @@ class MemoryStorage:
         self._messages[chat_id].append(f"{sender_name}: {message_text}")
     
     def get_recent_messages(self, chat_id: int, num_messages: int) -> List[str]:
-        return list(self._messages[chat_id])[-num_messages:]
+        messages = self._messages[chat_id]
+        # Walk back from the newest end so only the requested messages are visited
+        recent = list(islice(reversed(messages), max(num_messages, 0)))
+        recent.reverse()
+        return recent
     
     def set_summary_context(self, chat_id: int, summary_message_id: int, original_messages: List[str]) -> None:
         self._summary_context[chat_id] = {